@@ -22,9 +22,16 @@ class Settings(BaseSettings):
     MINIO_BUCKET_NAME: str = "crypto-data"
     MINIO_SECURE: bool = False  # Use HTTP for local development
 
+    # Distributed run (shard queue) Configuration
+    SHARD_HEARTBEAT_SECONDS: int = 10
+    SHARD_STALE_SECONDS: int = 60  # Running shards without a heartbeat this long are reclaimed
+    SHARD_MAX_ATTEMPTS: int = 3
+    SHARD_RETRY_BACKOFF_SECONDS: int = 30  # Failed shards wait attempts * backoff before being claimable again
+    SHARD_POLL_SECONDS: int = 5
+
     @property
     def DATABASE_URL(self):
-        return f"postgresql://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
+        return f"postgresql+psycopg2://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
     
     @property
     def S3_ENDPOINT(self):
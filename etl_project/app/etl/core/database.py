@@ -0,0 +1,8 @@
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from etl.core.config import settings
+
+engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
+
+# Objects stay usable after commit so claimed shards can be handed to workers
+SessionLocal = sessionmaker(bind=engine, expire_on_commit=False)
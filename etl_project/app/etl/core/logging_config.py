@@ -0,0 +1,6 @@
+import logging
+
+logging.basicConfig(level=logging.INFO,
+                    format='%(asctime)s - %(levelname)s - %(name)s - %(message)s')
+
+logger = logging.getLogger("etl")
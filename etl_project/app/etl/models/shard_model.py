@@ -0,0 +1,31 @@
+from sqlalchemy import Column, String, Integer, BigInteger, Text, TIMESTAMP, Index, text
+from sqlalchemy.dialects.postgresql import JSONB
+from etl.models.base import Base
+
+class EtlShard(Base):
+    """
+    One unit of work of a distributed run, claimed by workers through the shard queue.
+    """
+    __tablename__ = "etl_shard"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    run_id = Column(String, nullable=False)
+    source = Column(String, nullable=False)
+    kind = Column(String, nullable=False)  # page | ids | s3_key
+    params = Column(JSONB, nullable=False)
+    status = Column(String, nullable=False, server_default=text("'pending'"))  # pending | running | done | failed
+    attempts = Column(Integer, nullable=False, server_default=text("0"))
+    worker_id = Column(String)
+    # Timezone-aware so workers whose sessions use different timezones agree on staleness
+    claimed_at = Column(TIMESTAMP(timezone=True))
+    heartbeat_at = Column(TIMESTAMP(timezone=True))
+    finished_at = Column(TIMESTAMP(timezone=True))
+    available_at = Column(TIMESTAMP(timezone=True))  # Not claimable before this time, set when a failed shard is retried
+    rows_loaded = Column(Integer)
+    error = Column(Text)
+    created_at = Column(TIMESTAMP(timezone=True), server_default=text("NOW()"))
+
+    __table_args__ = (
+        Index("ix_etl_shard_status_id", "status", "id"),
+        Index("ix_etl_shard_run_id", "run_id"),
+    )
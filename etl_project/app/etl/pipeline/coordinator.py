@@ -0,0 +1,68 @@
+import argparse
+import uuid
+from typing import Any, Dict, List, Optional
+from etl.core.database import SessionLocal
+from etl.core.logging_config import logger
+from etl.pipeline.shard_queue import ShardQueue
+from etl.services.coingecko_extractor import CoinGeckoExtractor
+from etl.services.s3_extractor import list_keys
+
+def page_shards(first_page: int, last_page: int, per_page: int = 100) -> List[Dict[str, Any]]:
+    """
+    One shard per API result page, from first_page to last_page inclusive.
+    per_page cannot exceed the number of records CoinGecko returns in one request.
+    """
+    if per_page > CoinGeckoExtractor.MAX_PER_PAGE:
+        raise ValueError(f"per_page can be at most {CoinGeckoExtractor.MAX_PER_PAGE}, got {per_page}")
+    return [{"kind": "page", "params": {"page": page, "per_page": per_page}} for page in range(first_page, last_page + 1)]
+
+def id_shards(ids: List[str], chunk_size: int = 100) -> List[Dict[str, Any]]:
+    """
+    Split a list of coin ids into shards of at most chunk_size ids.
+    chunk_size is capped at the number of ids CoinGecko returns in one request.
+    """
+    chunk_size = min(chunk_size, CoinGeckoExtractor.MAX_PER_PAGE)
+    return [{"kind": "ids", "params": {"ids": ids[i:i + chunk_size]}} for i in range(0, len(ids), chunk_size)]
+
+def s3_shards(keys: List[str], bucket: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    One shard per S3 object key.
+    """
+    return [{"kind": "s3_key", "params": {"key": key, "bucket": bucket}} for key in keys]
+
+def start_run(queue: ShardQueue, source: str, shards: List[Dict[str, Any]], run_id: Optional[str] = None) -> str:
+    """
+    Register a new run and enqueue its shards for workers to claim.
+    
+    Returns:
+        str: The run id
+    """
+    run_id = run_id or uuid.uuid4().hex
+    queue.create_tables()
+    queue.enqueue(run_id, source, shards)
+    logger.info(f"Started run {run_id} with {len(shards)} shards")
+    return run_id
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Split an ETL run into shards")
+    parser.add_argument("--source", default="coingecko")
+    parser.add_argument("--run-id")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--pages", help="Page range, e.g. 1-10")
+    group.add_argument("--ids", help="Comma separated coin ids")
+    group.add_argument("--s3-prefix", help="Shard every object under this S3 prefix")
+    parser.add_argument("--per-page", type=int, default=100, help=f"Records per page, at most {CoinGeckoExtractor.MAX_PER_PAGE}")
+    parser.add_argument("--chunk-size", type=int, default=100, help=f"Ids per shard, at most {CoinGeckoExtractor.MAX_PER_PAGE}")
+    args = parser.parse_args()
+    
+    if args.pages:
+        first, _, last = args.pages.partition("-")
+        shards = page_shards(int(first), int(last or first), args.per_page)
+    elif args.ids:
+        shards = id_shards(args.ids.split(","), args.chunk_size)
+    else:
+        shards = s3_shards(list_keys(args.s3_prefix))
+    
+    queue = ShardQueue(SessionLocal)
+    print(start_run(queue, args.source, shards, args.run_id))
@@ -0,0 +1,201 @@
+from datetime import timedelta
+from typing import Any, Dict, List, Optional
+from sqlalchemy import select, update, func, case, or_
+from sqlalchemy.orm import sessionmaker
+from etl.core.config import settings
+from etl.core.logging_config import logger
+from etl.models.base import Base
+from etl.models.shard_model import EtlShard
+
+class ShardQueue:
+    """
+    PostgreSQL-backed work queue for distributed runs.
+    Shards are claimed with SELECT ... FOR UPDATE SKIP LOCKED, so any number of
+    workers on any number of hosts can pull from the same table without blocking each other.
+    """
+    
+    def __init__(
+        self,
+        session_factory: sessionmaker,
+        max_attempts: int = settings.SHARD_MAX_ATTEMPTS,
+        retry_backoff: int = settings.SHARD_RETRY_BACKOFF_SECONDS,
+    ):
+        """
+        Initialize the shard queue.
+        
+        Args:
+            session_factory: Session factory bound to the control database
+            max_attempts: Claims allowed per shard before it is marked failed
+            retry_backoff: Seconds per attempt a failed shard waits before it can be claimed again
+        """
+        self.session_factory = session_factory
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+    
+    def create_tables(self):
+        """
+        Create the control table if it doesn't exist.
+        """
+        # Resolve the engine through a session so factories using binds= or configure() work too
+        with self.session_factory() as session:
+            Base.metadata.create_all(session.get_bind(mapper=EtlShard), tables=[EtlShard.__table__])
+    
+    def enqueue(self, run_id: str, source: str, shards: List[Dict[str, Any]]) -> int:
+        """
+        Insert the shards of a run as pending work.
+        
+        Args:
+            run_id: Identifier of the run the shards belong to
+            source: Source name used by the transformer
+            shards: List of {"kind": ..., "params": {...}} dictionaries
+            
+        Returns:
+            int: Number of shards enqueued
+        """
+        with self.session_factory.begin() as session:
+            session.add_all(
+                EtlShard(run_id=run_id, source=source, kind=shard["kind"], params=shard["params"])
+                for shard in shards
+            )
+        logger.info(f"Enqueued {len(shards)} shards for run {run_id}")
+        return len(shards)
+    
+    def claim(self, worker_id: str, run_id: Optional[str] = None) -> Optional[EtlShard]:
+        """
+        Claim the oldest available pending shard, skipping rows locked by other workers.
+        
+        Args:
+            worker_id: Identifier of the claiming worker
+            run_id: Optional run to restrict the claim to
+            
+        Returns:
+            Optional[EtlShard]: The claimed shard, or None if no work is available
+        """
+        query = select(EtlShard).where(
+            EtlShard.status == "pending",
+            or_(EtlShard.available_at.is_(None), EtlShard.available_at <= func.now()),
+        )
+        if run_id is not None:
+            query = query.where(EtlShard.run_id == run_id)
+        query = query.order_by(EtlShard.id).limit(1).with_for_update(skip_locked=True)
+        
+        with self.session_factory.begin() as session:
+            shard = session.execute(query).scalar_one_or_none()
+            if shard is None:
+                return None
+            shard.status = "running"
+            shard.worker_id = worker_id
+            shard.attempts = EtlShard.attempts + 1
+            shard.claimed_at = func.now()
+            shard.heartbeat_at = func.now()
+            shard.error = None
+            session.flush()
+            session.refresh(shard)
+        return shard
+    
+    def heartbeat(self, shard_id: int, worker_id: str) -> bool:
+        """
+        Refresh the heartbeat of a running shard.
+        
+        Returns:
+            bool: False if the shard is no longer owned by this worker (e.g. it was reclaimed)
+        """
+        with self.session_factory.begin() as session:
+            result = session.execute(
+                update(EtlShard)
+                .where(EtlShard.id == shard_id, EtlShard.worker_id == worker_id, EtlShard.status == "running")
+                .values(heartbeat_at=func.now())
+                .execution_options(synchronize_session=False)
+            )
+        return result.rowcount == 1
+    
+    def complete(self, shard_id: int, worker_id: str, rows_loaded: int) -> bool:
+        """
+        Mark a shard owned by this worker as done.
+        
+        Returns:
+            bool: False if the shard is no longer owned by this worker
+        """
+        with self.session_factory.begin() as session:
+            result = session.execute(
+                update(EtlShard)
+                .where(EtlShard.id == shard_id, EtlShard.worker_id == worker_id, EtlShard.status == "running")
+                .values(status="done", finished_at=func.now(), rows_loaded=rows_loaded)
+                .execution_options(synchronize_session=False)
+            )
+        return result.rowcount == 1
+    
+    def fail(self, shard_id: int, worker_id: str, error: str) -> bool:
+        """
+        Release a shard after an error. It goes back to pending until max_attempts is reached,
+        and can only be claimed again after a backoff so transient source errors get time to clear.
+        
+        Returns:
+            bool: False if the shard is no longer owned by this worker
+        """
+        with self.session_factory.begin() as session:
+            result = session.execute(
+                update(EtlShard)
+                .where(EtlShard.id == shard_id, EtlShard.worker_id == worker_id, EtlShard.status == "running")
+                .values(
+                    status=self._retry_status(),
+                    worker_id=None,
+                    available_at=func.now() + EtlShard.attempts * timedelta(seconds=self.retry_backoff),
+                    error=error,
+                )
+                .execution_options(synchronize_session=False)
+            )
+        return result.rowcount == 1
+    
+    def reclaim_stale(self, stale_after: int = settings.SHARD_STALE_SECONDS) -> int:
+        """
+        Release running shards whose worker stopped heartbeating.
+        
+        Args:
+            stale_after: Seconds without a heartbeat before a shard is considered stuck
+            
+        Returns:
+            int: Number of shards reclaimed
+        """
+        with self.session_factory.begin() as session:
+            result = session.execute(
+                update(EtlShard)
+                .where(
+                    EtlShard.status == "running",
+                    EtlShard.heartbeat_at < func.now() - timedelta(seconds=stale_after),
+                )
+                .values(
+                    status=self._retry_status(),
+                    worker_id=None,
+                    error="heartbeat timed out",
+                )
+                .execution_options(synchronize_session=False)
+            )
+        if result.rowcount:
+            logger.warning(f"Reclaimed {result.rowcount} stale shards")
+        return result.rowcount
+    
+    def has_open(self, run_id: Optional[str] = None) -> bool:
+        """
+        Check whether any shard is still pending or running.
+        """
+        query = select(EtlShard.id).where(EtlShard.status.in_(["pending", "running"]))
+        if run_id is not None:
+            query = query.where(EtlShard.run_id == run_id)
+        with self.session_factory() as session:
+            return session.execute(query.limit(1)).first() is not None
+    
+    def status(self, run_id: str) -> Dict[str, int]:
+        """
+        Count the shards of a run by status.
+        """
+        query = (
+            select(EtlShard.status, func.count())
+            .where(EtlShard.run_id == run_id)
+            .group_by(EtlShard.status)
+        )
+        with self.session_factory() as session:
+            return {status: count for status, count in session.execute(query)}
+    
+    def _retry_status(self):
+        return case((EtlShard.attempts >= self.max_attempts, "failed"), else_="pending")
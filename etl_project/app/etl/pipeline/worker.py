@@ -0,0 +1,133 @@
+import argparse
+import os
+import socket
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from etl.core.config import settings
+from etl.core.database import engine, SessionLocal
+from etl.core.logging_config import logger
+from etl.models.shard_model import EtlShard
+from etl.pipeline.shard_queue import ShardQueue
+from etl.services.coingecko_extractor import CoinGeckoExtractor
+from etl.services.loader import Loader
+from etl.services.s3_extractor import S3Extractor
+from etl.services.transformer import transformer
+
+class ShardWorker:
+    """
+    Claims shards from the queue and runs extract -> transform -> load for each,
+    heartbeating in the background so stuck shards can be told apart from slow ones.
+    """
+    
+    def __init__(
+        self,
+        queue: ShardQueue,
+        loader: Loader,
+        worker_id: Optional[str] = None,
+        heartbeat_interval: int = settings.SHARD_HEARTBEAT_SECONDS,
+        stale_after: int = settings.SHARD_STALE_SECONDS,
+        poll_interval: float = settings.SHARD_POLL_SECONDS,
+    ):
+        self.queue = queue
+        self.loader = loader
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.heartbeat_interval = heartbeat_interval
+        self.stale_after = stale_after
+        self.poll_interval = poll_interval
+    
+    def run(self, run_id: Optional[str] = None, exit_when_idle: bool = True) -> int:
+        """
+        Process shards until the queue is drained.
+        
+        Args:
+            run_id: Optional run to restrict work to
+            exit_when_idle: Stop once no shard is pending or running, otherwise poll forever
+            
+        Returns:
+            int: Number of shards completed by this worker
+        """
+        logger.info(f"Worker {self.worker_id} started")
+        completed = 0
+        while True:
+            try:
+                self.queue.reclaim_stale(self.stale_after)
+                shard = self.queue.claim(self.worker_id, run_id)
+                # Running shards may still be reclaimed, so only stop once nothing is open
+                if shard is None and exit_when_idle and not self.queue.has_open(run_id):
+                    break
+            except Exception as e:
+                logger.error(f"Worker {self.worker_id} could not reach the shard queue: {e}")
+                shard = None
+            if shard is None:
+                time.sleep(self.poll_interval)
+                continue
+            if self.process(shard):
+                completed += 1
+        logger.info(f"Worker {self.worker_id} finished, completed {completed} shards")
+        return completed
+    
+    def process(self, shard: EtlShard) -> bool:
+        """
+        Run a single claimed shard end to end.
+        
+        Returns:
+            bool: True if the shard was completed by this worker
+        """
+        logger.info(f"Worker {self.worker_id} processing shard {shard.id} ({shard.kind} {shard.params})")
+        stop = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(shard.id, stop), daemon=True)
+        heartbeat.start()
+        try:
+            data = self.extract(shard)
+            df = transformer.transform(shard.source, data)
+            rows = self.loader.load(shard.source, df)
+        except Exception as e:
+            logger.error(f"Shard {shard.id} failed: {e}")
+            self._update_shard(lambda: self.queue.fail(shard.id, self.worker_id, str(e)), shard.id)
+            return False
+        finally:
+            stop.set()
+            heartbeat.join()
+        
+        completed = self._update_shard(lambda: self.queue.complete(shard.id, self.worker_id, rows), shard.id)
+        if completed is False:
+            logger.warning(f"Shard {shard.id} was reclaimed before worker {self.worker_id} finished it")
+        return bool(completed)
+    
+    def extract(self, shard: EtlShard) -> List[Dict[str, Any]]:
+        if shard.kind == "s3_key":
+            return S3Extractor(**shard.params).extract()
+        if shard.kind in ("page", "ids"):
+            return CoinGeckoExtractor().extract(**shard.params)
+        raise ValueError(f"Unsupported shard kind: {shard.kind}")
+    
+    def _update_shard(self, bookkeeping, shard_id: int) -> Optional[bool]:
+        # A control DB error here must not kill the worker; the shard stays
+        # running and is picked up again by reclaim_stale
+        try:
+            return bookkeeping()
+        except Exception as e:
+            logger.error(f"Could not update shard {shard_id}: {e}")
+            return None
+    
+    def _heartbeat(self, shard_id: int, stop: threading.Event):
+        while not stop.wait(self.heartbeat_interval):
+            try:
+                if not self.queue.heartbeat(shard_id, self.worker_id):
+                    break
+            except Exception as e:
+                logger.error(f"Heartbeat for shard {shard_id} failed: {e}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Process shards of distributed ETL runs")
+    parser.add_argument("--run-id", help="Only process shards of this run")
+    parser.add_argument("--forever", action="store_true", help="Keep polling when the queue is empty")
+    args = parser.parse_args()
+    
+    queue = ShardQueue(SessionLocal)
+    loader = Loader(engine)
+    queue.create_tables()
+    loader.create_tables()
+    ShardWorker(queue, loader).run(run_id=args.run_id, exit_when_idle=not args.forever)
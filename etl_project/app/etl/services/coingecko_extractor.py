@@ -4,7 +4,7 @@ import sys
 app_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 sys.path.insert(0, app_dir)
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 from etl.services.api_extractor import APIExtractor
 from etl.core.logging_config import logger
 
@@ -14,23 +14,38 @@ class CoinGeckoExtractor(APIExtractor):
     Fetches market data for top cryptocurrencies.
     """
     
+    MAX_PER_PAGE = 250
+    
     def __init__(self):
         super().__init__(base_url="https://api.coingecko.com/api/v3")
     
-    def extract(self) -> List[Dict[str, Any]]:
+    def extract(self, page: int = 1, per_page: int = 100, ids: Optional[List[str]] = None) -> List[Dict[str, Any]]:
         """
         Extract cryptocurrency market data from CoinGecko API.
         
+        Args:
+            page: Result page to fetch
+            per_page: Number of records per page
+            ids: Optional list of coin ids to restrict the request to
+            
         Returns:
             List[Dict[str, Any]]: List of cryptocurrency records
         """
         params = {
             "vs_currency": "usd",
             "order": "market_cap_desc",
-            "per_page": 100,
-            "page": 1,
+            "per_page": per_page,
+            "page": page,
             "sparkline": False
         }
+        if ids:
+            if len(ids) > self.MAX_PER_PAGE:
+                raise ValueError(f"At most {self.MAX_PER_PAGE} ids can be fetched per request, got {len(ids)}")
+            params["ids"] = ",".join(ids)
+            params["per_page"] = min(max(per_page, len(ids)), self.MAX_PER_PAGE)
+        elif per_page > self.MAX_PER_PAGE:
+            # The API would return MAX_PER_PAGE rows and page offsets would no longer line up
+            raise ValueError(f"At most {self.MAX_PER_PAGE} records can be fetched per page, got {per_page}")
         
         try:
             data = self.get("/coins/markets", params=params)
@@ -0,0 +1,43 @@
+import pandas as pd
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.engine import Engine
+from etl.core.logging_config import logger
+from etl.models.base import Base
+from etl.services.transformer import transformer
+
+class Loader:
+    def __init__(self, engine: Engine):
+        self.engine = engine
+
+    def create_tables(self):
+        Base.metadata.create_all(self.engine)
+
+    def load(self, source, df) -> int:
+        """
+        Upsert transformed rows into the model table of the source.
+        Upserting keeps loads idempotent, so a reclaimed shard can safely be loaded twice.
+        """
+        if df.empty:
+            return 0
+        try:
+            table = transformer.source_to_model(source).__table__
+            primary_key = [c.name for c in table.primary_key]
+
+            # ON CONFLICT cannot touch the same row twice in one statement
+            df = df.drop_duplicates(subset=primary_key, keep="last")
+            records = df.astype(object).where(pd.notna(df), None).to_dict("records")
+            # Rows are passed as executemany parameters rather than baked into the
+            # statement, so it compiles once and is reused from SQLAlchemy's cache
+            stmt = insert(table)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=primary_key,
+                set_={c: stmt.excluded[c] for c in df.columns if c not in primary_key},
+            )
+
+            with self.engine.begin() as conn:
+                conn.execute(stmt, records)
+            logger.info(f"Loaded {len(records)} rows into {table.name}")
+            return len(records)
+        except Exception as e:
+            logger.error(f"Failed to load data: {e}")
+            raise
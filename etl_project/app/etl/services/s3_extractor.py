@@ -0,0 +1,75 @@
+import io
+import json
+import boto3
+import pandas as pd
+from typing import Any, Dict, List, Optional
+from etl.services.base_extractor import BaseExtractor
+from etl.core.config import settings
+from etl.core.logging_config import logger
+
+def s3_client():
+    """
+    Create an S3 client for the configured endpoint (MinIO or AWS).
+    """
+    return boto3.client(
+        "s3",
+        endpoint_url=settings.S3_ENDPOINT,
+        aws_access_key_id=settings.S3_ACCESS_KEY,
+        aws_secret_access_key=settings.S3_SECRET_KEY,
+        region_name=settings.AWS_REGION,
+    )
+
+def list_keys(prefix: str = "", bucket: Optional[str] = None) -> List[str]:
+    """
+    List object keys in a bucket under a prefix.
+    
+    Args:
+        prefix: Key prefix to filter on
+        bucket: Bucket name, defaults to the configured bucket
+        
+    Returns:
+        List[str]: Matching object keys
+    """
+    keys = []
+    paginator = s3_client().get_paginator("list_objects_v2")
+    for page in paginator.paginate(Bucket=bucket or settings.BUCKET_NAME, Prefix=prefix):
+        keys.extend(obj["Key"] for obj in page.get("Contents", []))
+    return keys
+
+class S3Extractor(BaseExtractor):
+    """
+    Extractor for a single object stored in S3 (or MinIO).
+    Supports JSON (list of records) and CSV objects.
+    """
+    
+    def __init__(self, key: str, bucket: Optional[str] = None):
+        """
+        Initialize the S3 extractor.
+        
+        Args:
+            key: Object key to read
+            bucket: Bucket name, defaults to the configured bucket
+        """
+        self.key = key
+        self.bucket = bucket or settings.BUCKET_NAME
+        self.client = s3_client()
+    
+    def extract(self) -> List[Dict[str, Any]]:
+        """
+        Extract records from the S3 object.
+        
+        Returns:
+            List[Dict[str, Any]]: List of records
+        """
+        try:
+            response = self.client.get_object(Bucket=self.bucket, Key=self.key)
+            body = response["Body"].read()
+            if self.key.endswith(".csv"):
+                data = pd.read_csv(io.BytesIO(body)).to_dict("records")
+            else:
+                data = json.loads(body)
+            logger.info(f"Extracted {len(data)} records from s3://{self.bucket}/{self.key}")
+            return data
+        except Exception as e:
+            logger.error(f"Failed to extract data from s3://{self.bucket}/{self.key}: {e}")
+            raise
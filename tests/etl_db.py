@@ -0,0 +1,29 @@
+import os
+import sys
+from dotenv import load_dotenv
+from sqlalchemy import create_engine
+from sqlalchemy.engine import URL
+
+load_dotenv()
+
+DB_HOST = os.getenv("DB_HOST")
+DB_NAME = os.getenv("DB_NAME")
+DB_USER = os.getenv("DB_USER")
+DB_PASS = os.getenv("DB_PASS")
+DB_PORT = os.getenv("DB_PORT")
+
+# etl.core.config expects DB_PASSWORD, this folder's .env uses DB_PASS
+os.environ.setdefault("DB_PASSWORD", DB_PASS or "")
+
+# Make the etl package importable from the app folder
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "etl_project", "app"))
+
+
+def is_configured():
+    return all([DB_HOST, DB_NAME, DB_USER, DB_PORT])
+
+
+def make_engine(**kwargs):
+    return create_engine(URL.create(
+        "postgresql+psycopg2", username=DB_USER, password=DB_PASS, host=DB_HOST, port=int(DB_PORT), database=DB_NAME,
+    ), **kwargs)
@@ -0,0 +1,77 @@
+import time
+import uuid
+import logging
+from multiprocessing import Pool
+from etl_db import make_engine
+from sqlalchemy import delete
+from sqlalchemy.orm import sessionmaker
+from etl.models.crypto_model import CryptoPrice
+from etl.models.shard_model import EtlShard
+from etl.pipeline.coordinator import start_run, page_shards
+from etl.pipeline.shard_queue import ShardQueue
+from etl.pipeline.worker import ShardWorker
+from etl.services.loader import Loader
+
+# Simulated API latency per shard, the part that adding workers parallelizes
+EXTRACT_LATENCY = 0.2
+SHARDS = 40
+ROWS_PER_SHARD = 100
+
+
+class BenchmarkWorker(ShardWorker):
+    def extract(self, shard):
+        time.sleep(EXTRACT_LATENCY)
+        return [
+            {
+                "id": f"{shard.run_id}-{shard.params['page']}-{i}",
+                "symbol": "bch",
+                "name": "benchmark",
+                "current_price": 1.0,
+                "market_cap": 1000,
+                "total_volume": 100,
+                "last_updated": "2024-01-01T00:00:00.000Z",
+            }
+            for i in range(ROWS_PER_SHARD)
+        ]
+
+
+def run_worker(args):
+    run_id, worker_no = args
+    engine = make_engine()
+    queue = ShardQueue(sessionmaker(bind=engine, expire_on_commit=False))
+    worker = BenchmarkWorker(queue, Loader(engine), worker_id=f"bench-{worker_no}", poll_interval=0)
+    completed = worker.run(run_id)
+    engine.dispose()
+    return completed
+
+
+def benchmark(engine, workers):
+    session_factory = sessionmaker(bind=engine, expire_on_commit=False)
+    run_id = f"bench-{uuid.uuid4().hex}"
+    start_run(ShardQueue(session_factory), "coingecko", page_shards(1, SHARDS), run_id)
+    # Worker processes open their own connections
+    engine.dispose()
+
+    start = time.perf_counter()
+    with Pool(workers) as pool:
+        completed = sum(pool.map(run_worker, [(run_id, i) for i in range(workers)]))
+    elapsed = time.perf_counter() - start
+
+    with session_factory.begin() as session:
+        session.execute(delete(EtlShard).where(EtlShard.run_id == run_id))
+        session.execute(delete(CryptoPrice).where(CryptoPrice.id.like(f"{run_id}%")))
+    return completed, elapsed
+
+
+if __name__ == "__main__":
+    engine = make_engine()
+    Loader(engine).create_tables()
+
+    baseline = None
+    for workers in [1, 2, 4, 8]:
+        completed, elapsed = benchmark(engine, workers)
+        baseline = baseline or elapsed
+        logging.info(
+            f"{workers} workers: {completed} shards in {elapsed:.2f}s, "
+            f"{completed / elapsed:.1f} shards/s, speedup {baseline / elapsed:.2f}x"
+        )
@@ -0,0 +1,269 @@
+import threading
+import time
+import uuid
+from datetime import timedelta
+
+import pytest
+
+import etl_db
+
+if not etl_db.is_configured():
+    pytest.skip("PostgreSQL settings not found in .env", allow_module_level=True)
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from etl.models.crypto_model import CryptoPrice
+from etl.models.shard_model import EtlShard
+from etl.pipeline.coordinator import start_run, page_shards, id_shards
+from etl.pipeline.shard_queue import ShardQueue
+from etl.pipeline.worker import ShardWorker
+from etl.services.loader import Loader
+from etl.services.transformer import transformer
+
+
+@pytest.fixture(scope="module")
+def engine():
+    engine = etl_db.make_engine()
+    try:
+        with engine.connect():
+            pass
+    except OperationalError as e:
+        pytest.skip(f"PostgreSQL is unreachable: {e}")
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(scope="module")
+def session_factory(engine):
+    return sessionmaker(bind=engine, expire_on_commit=False)
+
+
+@pytest.fixture(scope="module")
+def loader(engine):
+    loader = Loader(engine)
+    loader.create_tables()
+    return loader
+
+
+@pytest.fixture
+def run_id(session_factory, loader):
+    run_id = f"test-{uuid.uuid4().hex}"
+    ShardQueue(session_factory).create_tables()
+    yield run_id
+    with session_factory.begin() as session:
+        session.execute(delete(EtlShard).where(EtlShard.run_id == run_id))
+        session.execute(delete(CryptoPrice).where(CryptoPrice.id.like(f"{run_id}%")))
+
+
+def coin(coin_id, price=1.0):
+    return {
+        "id": coin_id,
+        "symbol": coin_id[:3],
+        "name": coin_id,
+        "current_price": price,
+        "market_cap": 1000,
+        "total_volume": 100,
+        "last_updated": "2024-01-01T00:00:00.000Z",
+    }
+
+
+def shard_status(session_factory, shard_id):
+    with session_factory() as session:
+        return session.get(EtlShard, shard_id).status
+
+
+def backdate_heartbeat(session_factory, shard_id, seconds):
+    with session_factory.begin() as session:
+        session.execute(
+            update(EtlShard)
+            .where(EtlShard.id == shard_id)
+            .values(heartbeat_at=func.now() - timedelta(seconds=seconds))
+        )
+
+
+class StubWorker(ShardWorker):
+    """
+    Worker that fabricates one record per shard instead of calling the API.
+    """
+
+    def extract(self, shard):
+        return [coin(f"{shard.run_id}-{shard.params['page']}")]
+
+
+def test_concurrent_claims_get_distinct_shards(session_factory, run_id):
+    queue = ShardQueue(session_factory)
+    start_run(queue, "coingecko", page_shards(1, 40), run_id)
+
+    claimed = []
+    barrier = threading.Barrier(8)
+
+    def claim_all(worker_id):
+        barrier.wait()
+        while True:
+            shard = queue.claim(worker_id, run_id)
+            if shard is None:
+                return
+            claimed.append(shard.id)
+
+    threads = [threading.Thread(target=claim_all, args=(f"worker-{i}",)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(claimed) == 40
+    assert len(set(claimed)) == 40
+    assert queue.status(run_id) == {"running": 40}
+
+
+def test_stale_shard_is_reclaimed(session_factory, run_id):
+    queue = ShardQueue(session_factory)
+    start_run(queue, "coingecko", page_shards(1, 1), run_id)
+
+    shard = queue.claim("worker-a", run_id)
+    assert queue.heartbeat(shard.id, "worker-a")
+
+    # A fresh heartbeat keeps the shard running
+    queue.reclaim_stale(stale_after=60)
+    assert shard_status(session_factory, shard.id) == "running"
+
+    backdate_heartbeat(session_factory, shard.id, 3600)
+    assert queue.reclaim_stale(stale_after=60) >= 1
+    assert shard_status(session_factory, shard.id) == "pending"
+
+    # The original owner has lost the shard
+    assert not queue.heartbeat(shard.id, "worker-a")
+    assert not queue.complete(shard.id, "worker-a", 1)
+
+    reclaimed = queue.claim("worker-b", run_id)
+    assert reclaimed.id == shard.id
+    assert reclaimed.attempts == 2
+    assert queue.complete(shard.id, "worker-b", 1)
+    assert queue.status(run_id) == {"done": 1}
+
+
+def test_stale_check_is_independent_of_session_timezone(run_id):
+    engines = [
+        etl_db.make_engine(connect_args={"options": f"-c timezone={tz}"})
+        for tz in ("America/New_York", "UTC")
+    ]
+    new_york, utc = [ShardQueue(sessionmaker(bind=e, expire_on_commit=False)) for e in engines]
+    start_run(new_york, "coingecko", page_shards(1, 2), run_id)
+
+    # A live shard claimed from one timezone is not stale for a worker in another
+    live = new_york.claim("worker-ny", run_id)
+    utc.reclaim_stale(stale_after=60)
+    assert shard_status(utc.session_factory, live.id) == "running"
+
+    # A stuck shard claimed from one timezone is reclaimed by a worker in another
+    stuck = utc.claim("worker-utc", run_id)
+    backdate_heartbeat(new_york.session_factory, stuck.id, 120)
+    new_york.reclaim_stale(stale_after=60)
+    assert shard_status(new_york.session_factory, stuck.id) == "pending"
+    assert shard_status(new_york.session_factory, live.id) == "running"
+
+    for e in engines:
+        e.dispose()
+
+
+def test_failed_shard_waits_for_backoff(session_factory, run_id):
+    queue = ShardQueue(session_factory, retry_backoff=60)
+    start_run(queue, "coingecko", page_shards(1, 1), run_id)
+
+    shard = queue.claim("worker-a", run_id)
+    assert queue.fail(shard.id, "worker-a", "rate limited")
+    assert shard_status(session_factory, shard.id) == "pending"
+    assert queue.claim("worker-a", run_id) is None
+    assert queue.has_open(run_id)
+
+    with session_factory.begin() as session:
+        session.execute(update(EtlShard).where(EtlShard.id == shard.id).values(available_at=func.now()))
+    assert queue.claim("worker-b", run_id).id == shard.id
+
+
+def test_shard_fails_after_max_attempts(session_factory, run_id):
+    queue = ShardQueue(session_factory, max_attempts=2, retry_backoff=0)
+    start_run(queue, "coingecko", page_shards(1, 1), run_id)
+
+    shard = queue.claim("worker-a", run_id)
+    assert queue.fail(shard.id, "worker-a", "boom")
+    assert shard_status(session_factory, shard.id) == "pending"
+
+    shard = queue.claim("worker-b", run_id)
+    backdate_heartbeat(session_factory, shard.id, 3600)
+    queue.reclaim_stale(stale_after=60)
+
+    assert shard_status(session_factory, shard.id) == "failed"
+    assert queue.claim("worker-c", run_id) is None
+    assert not queue.has_open(run_id)
+
+
+def test_workers_drain_run(session_factory, loader, run_id):
+    queue = ShardQueue(session_factory)
+    start_run(queue, "coingecko", page_shards(1, 12), run_id)
+
+    workers = [
+        StubWorker(queue, loader, worker_id=f"worker-{i}", heartbeat_interval=1, poll_interval=0)
+        for i in range(3)
+    ]
+    completed = []
+    threads = [threading.Thread(target=lambda w=w: completed.append(w.run(run_id))) for w in workers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sum(completed) == 12
+    assert queue.status(run_id) == {"done": 12}
+    with session_factory() as session:
+        loaded = session.execute(select(CryptoPrice.id).where(CryptoPrice.id.like(f"{run_id}%"))).all()
+    assert len(loaded) == 12
+
+
+def test_worker_retries_failing_shard_until_failed(session_factory, loader, run_id):
+    class FailingWorker(ShardWorker):
+        def extract(self, shard):
+            raise RuntimeError("source unavailable")
+
+    queue = ShardQueue(session_factory, max_attempts=3, retry_backoff=1)
+    start_run(queue, "coingecko", page_shards(1, 1), run_id)
+
+    start = time.perf_counter()
+    assert FailingWorker(queue, loader, poll_interval=0.1).run(run_id) == 0
+    # Retries wait 1s after the first attempt and 2s after the second
+    assert time.perf_counter() - start >= 3
+    with session_factory() as session:
+        shard = session.execute(select(EtlShard).where(EtlShard.run_id == run_id)).scalar_one()
+    assert shard.status == "failed"
+    assert shard.attempts == 3
+    assert shard.error == "source unavailable"
+
+
+def test_loader_upsert_is_idempotent(session_factory, loader, run_id):
+    data = [coin(f"{run_id}-a", 1.0), coin(f"{run_id}-b", 2.0), coin(f"{run_id}-a", 3.0)]
+    df = transformer.transform("coingecko", data)
+
+    assert loader.load("coingecko", df) == 2
+    assert loader.load("coingecko", df) == 2
+
+    with session_factory() as session:
+        rows = dict(session.execute(
+            select(CryptoPrice.id, CryptoPrice.current_price).where(CryptoPrice.id.like(f"{run_id}%"))
+        ).all())
+    assert rows == {f"{run_id}-a": 3.0, f"{run_id}-b": 2.0}
+
+
+def test_id_shards_respect_api_page_limit():
+    ids = [f"coin-{i}" for i in range(600)]
+    shards = id_shards(ids, chunk_size=1000)
+
+    assert [len(s["params"]["ids"]) for s in shards] == [250, 250, 100]
+    assert [i for s in shards for i in s["params"]["ids"]] == ids
+
+
+def test_page_shards_respect_api_page_limit():
+    assert page_shards(1, 2, per_page=250)[1]["params"] == {"page": 2, "per_page": 250}
+    with pytest.raises(ValueError):
+        page_shards(1, 10, per_page=500)